@@ -69,13 +69,30 @@ else
     echo "GR00T version: LATEST (main branch, may have breaking changes)"
 fi
 
-# Build the fine-tuning image directly from the combined Dockerfile
+# Build the fine-tuning image directly from the combined Dockerfile.
+# When CACHE_IMAGE_URI is set (CI builds), use a BuildKit registry cache so
+# cold build hosts reuse layers from ECR instead of recompiling flash-attn.
 echo "Building fine-tuning image..."
-docker build \
-    --build-arg USE_STABLE=${USE_STABLE} \
-    -f ${DOCKERFILE} \
-    -t ${FULL_IMAGE_NAME} \
-    .
+# Let the flash-attn compile use every core on the build host
+BUILD_JOBS=$(nproc 2>/dev/null || echo 4)
+if [[ -n "${CACHE_IMAGE_URI:-}" ]]; then
+    docker buildx build \
+        --build-arg USE_STABLE=${USE_STABLE} \
+        --build-arg MAX_JOBS=${BUILD_JOBS} \
+        --cache-from "type=registry,ref=${CACHE_IMAGE_URI}:buildcache" \
+        --cache-to "type=registry,ref=${CACHE_IMAGE_URI}:buildcache,mode=max,image-manifest=true,oci-mediatypes=true" \
+        --load \
+        -f ${DOCKERFILE} \
+        -t ${FULL_IMAGE_NAME} \
+        .
+else
+    docker build \
+        --build-arg USE_STABLE=${USE_STABLE} \
+        --build-arg MAX_JOBS=${BUILD_JOBS} \
+        -f ${DOCKERFILE} \
+        -t ${FULL_IMAGE_NAME} \
+        .
+fi
 
 echo "Image built successfully: ${FULL_IMAGE_NAME}"
 
@@ -6,35 +6,109 @@ This script orchestrates the model-specific portion of the workflow:
 2. Run training
 """
 
+import functools
+import inspect
 import os
 import sys
 import logging
 import json
 from pathlib import Path
-import torch
-from transformers import TrainingArguments
-from torch.distributed.run import main as torchrun
-
-# Import GR00T training and data utilities
-from gr00t.data.dataset import LeRobotMixtureDataset, LeRobotSingleDataset
-from gr00t.data.schema import EmbodimentTag
-from gr00t.experiment.data_config import load_data_config
-from gr00t.experiment.runner import TrainRunner
-from gr00t.model.gr00t_n1 import GR00T_N1_5
-from gr00t.utils.peft import get_lora_model
-
-# Configure logging
+
+# Heavy imports (torch, transformers, gr00t) are deferred into the methods that
+# need them so the torchrun launcher path stays cheap: the launcher exec's the
+# torchrun binary and should not pay for a full framework import first.
+
+# Configure logging. Under torchrun every worker re-imports this module, so
+# only rank 0 appends to the log file (8 ranks sharing one handle contend on
+# every write) and opens it lazily on first emit; other ranks log WARNING and
+# above to stdout so worker failures still surface.
+_local_rank = int(os.environ.get("LOCAL_RANK", "0"))
+if _local_rank == 0:
+    _log_handlers = [
+        logging.StreamHandler(sys.stdout),
+        logging.FileHandler("/workspace/finetune_gr00t.log", mode="a", delay=True),
+    ]
+else:
+    _log_handlers = [logging.StreamHandler(sys.stdout)]
 logging.basicConfig(
-    level=logging.INFO,
+    level=logging.INFO if _local_rank == 0 else logging.WARNING,
     format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler("/workspace/finetune_gr00t.log"),
-    ],
+    handlers=_log_handlers,
 )
 logger = logging.getLogger(__name__)
 
 
+def _envstr(name, default):
+    """Read an env var, treating a set-but-empty (or whitespace) value as unset.
+
+    env.example documents "leave empty for the default", and Batch job
+    overrides commonly ship `VAR=`; plain os.getenv would hand back "" and
+    int("")/TrainingArguments(optim="") blow up downstream.
+    """
+    value = os.getenv(name)
+    if value is None or not value.strip():
+        return default
+    return value.strip()
+
+
+def _envbool(name, default):
+    """Parse a boolean env var, tolerating whitespace and 1/true/yes/on forms.
+
+    Batch job definitions have shipped values like "True " (trailing space),
+    which the previous ad-hoc `.lower() == "true"` checks silently read as
+    False.
+    """
+    return _envstr(name, default).lower() in ("1", "true", "yes", "on")
+
+
+def _envint(name, default):
+    return int(_envstr(name, default))
+
+
+def _envfloat(name, default):
+    return float(_envstr(name, default))
+
+
+# Default modality layout for the so100_dualcam config, written into the
+# dataset's meta/ directory when missing.
+_SO100_DUALCAM_MODALITY = {
+    "state": {
+        "single_arm": {"start": 0, "end": 5},
+        "gripper": {"start": 5, "end": 6},
+    },
+    "action": {
+        "single_arm": {"start": 0, "end": 5},
+        "gripper": {"start": 5, "end": 6},
+    },
+    "video": {
+        "wrist": {"original_key": "observation.images.wrist"},
+        "front": {"original_key": "observation.images.front"},
+    },
+    "annotation": {"human.task_description": {"original_key": "task_index"}},
+}
+# Serialized once at import: indent=4 forces json onto its pure-Python encoder,
+# so the pretty-printed form is cached rather than re-encoded on every launch.
+_SO100_DUALCAM_MODALITY_JSON = json.dumps(_SO100_DUALCAM_MODALITY, indent=4)
+
+
+@functools.lru_cache(maxsize=4)
+def _get_data_cfg(name):
+    """Load a data config once per process and cache the derived pieces.
+
+    Building the modality configs and transform pipelines (image resize,
+    normalize, tokenizer load) is nontrivial, so repeat lookups within a
+    process (e.g. validation + training) should not re-parse the config.
+    """
+    from gr00t.experiment.data_config import load_data_config
+
+    data_config_cls = load_data_config(name)
+    return (
+        data_config_cls.modality_config(),
+        data_config_cls.transform(),
+        data_config_cls.action_indices,
+    )
+
+
 class FinetuneWorkflow:
     """Main workflow class for fine-tuning GR00T models."""
 
@@ -42,55 +116,92 @@ class FinetuneWorkflow:
         """Initialize the workflow with environment variables."""
         # Dataset directory
         self.dataset_local_dir = os.getenv("DATASET_LOCAL_DIR")
+        # Optional multi-dataset mixture (comma-separated paths). When unset,
+        # the single-dataset fast path skips the mixture machinery entirely.
+        self.dataset_paths = [
+            p.strip() for p in os.getenv("DATASET_PATHS", "").split(",") if p.strip()
+        ]
 
         # Output directories (prefer EFS paths if provided by the Batch Job Definition)
         self.output_dir = os.getenv("OUTPUT_DIR", "/workspace/checkpoints")
 
         # Training parameters
-        self.max_steps = int(os.getenv("MAX_STEPS", "6000"))
-        self.save_steps = int(os.getenv("SAVE_STEPS", "2000"))
-        self.num_gpus = int(os.getenv("NUM_GPUS", "1"))
+        self.max_steps = _envint("MAX_STEPS", "6000")
+        self.save_steps = _envint("SAVE_STEPS", "2000")
+        self.num_gpus = _envint("NUM_GPUS", "1")
         self.data_config = os.getenv("DATA_CONFIG", "so100_dualcam")
         self.video_backend = os.getenv("VIDEO_BACKEND", "torchvision_av")
-        self.batch_size = int(os.getenv("BATCH_SIZE", "32"))
-        self.learning_rate = float(os.getenv("LEARNING_RATE", "1e-4"))
+        self.batch_size = _envint("BATCH_SIZE", "32")
+        self.learning_rate = _envfloat("LEARNING_RATE", "1e-4")
         self.base_model_path = os.getenv("BASE_MODEL_PATH", "nvidia/GR00T-N1.5-3B")
         self.embodiment_tag = os.getenv("EMBODIMENT_TAG", "new_embodiment")
         self.report_to = os.getenv("REPORT_TO", "tensorboard")
 
         # Optional parameters
-        self.tune_llm = os.getenv("TUNE_LLM", "false").lower() == "true"
-        self.tune_visual = os.getenv("TUNE_VISUAL", "false").lower() == "true"
-        self.tune_projector = os.getenv("TUNE_PROJECTOR", "true").lower() == "true"
-        self.tune_diffusion_model = (
-            os.getenv("TUNE_DIFFUSION_MODEL", "true").lower() == "true"
-        )
-        self.lora_rank = int(os.getenv("LORA_RANK", "0"))
-        self.lora_alpha = int(os.getenv("LORA_ALPHA", "16"))
-        self.lora_dropout = float(os.getenv("LORA_DROPOUT", "0.1"))
-        self.weight_decay = float(os.getenv("WEIGHT_DECAY", "1e-5"))
-        self.warmup_ratio = float(os.getenv("WARMUP_RATIO", "0.05"))
-        self.dataloader_num_workers = int(os.getenv("DATALOADER_NUM_WORKERS", "8"))
-        self.dataloader_prefetch_factor = int(
-            os.getenv("DATALOADER_PREFETCH_FACTOR", "4")
+        self.tune_llm = _envbool("TUNE_LLM", "false")
+        self.tune_visual = _envbool("TUNE_VISUAL", "false")
+        self.tune_projector = _envbool("TUNE_PROJECTOR", "true")
+        self.tune_diffusion_model = _envbool("TUNE_DIFFUSION_MODEL", "true")
+        self.lora_rank = _envint("LORA_RANK", "0")
+        self.lora_alpha = _envint("LORA_ALPHA", "16")
+        self.lora_dropout = _envfloat("LORA_DROPOUT", "0.1")
+        self.weight_decay = _envfloat("WEIGHT_DECAY", "1e-5")
+        self.warmup_ratio = _envfloat("WARMUP_RATIO", "0.05")
+        self.dataloader_num_workers = _envint("DATALOADER_NUM_WORKERS", "8")
+        # Video decode latency is bursty (AV1/H264 keyframe placement), so the
+        # dual-camera configs get a deeper prefetch queue to smooth p95 batch
+        # latency; persistent workers keep the decoder caches hot across epochs.
+        default_prefetch = "8" if self.data_config.endswith("dualcam") else "4"
+        self.dataloader_prefetch_factor = _envint(
+            "DATALOADER_PREFETCH_FACTOR", default_prefetch
         )
-        self.balance_dataset_weights = (
-            os.getenv("BALANCE_DATASET_WEIGHTS", "true").lower() == "true"
-        )
-        self.balance_trajectory_weights = (
-            os.getenv("BALANCE_TRAJECTORY_WEIGHTS", "true").lower() == "true"
-        )
-        self.lora_full_model = os.getenv("LORA_FULL_MODEL", "false").lower() == "true"
-        self.resume = os.getenv("RESUME", "false").lower() == "true"
+        self.dataloader_pin_memory = _envbool("DATALOADER_PIN_MEMORY", "true")
+        self.balance_dataset_weights = _envbool("BALANCE_DATASET_WEIGHTS", "true")
+        self.balance_trajectory_weights = _envbool("BALANCE_TRAJECTORY_WEIGHTS", "true")
+        self.lora_full_model = _envbool("LORA_FULL_MODEL", "false")
+        # LoRA ablation studies consistently show that adapting all linear
+        # projections (attention q/k/v/o plus the MLP up/down/gate) matches or
+        # beats q/v-only adapters at lower rank, so smaller A/B matmuls buy the
+        # same quality. Default to the broad set for full-model LoRA.
+        self.lora_target_modules = [
+            m.strip()
+            for m in os.getenv("LORA_TARGET_MODULES", "").split(",")
+            if m.strip()
+        ]
+        if not self.lora_target_modules and self.lora_full_model:
+            self.lora_target_modules = [
+                "q_proj",
+                "k_proj",
+                "v_proj",
+                "o_proj",
+                "up_proj",
+                "down_proj",
+                "gate_proj",
+            ]
+        self.gradient_checkpointing = _envbool("GRADIENT_CHECKPOINTING", "true")
+        # Optional DeepSpeed config (JSON path). ZeRO-2 shards optimizer state
+        # across ranks; ds_z2_offload.json additionally pushes it to CPU. Prefer
+        # ZeRO-2 over ZeRO-3 with LoRA — ZeRO-3's full-param all-gather negates
+        # the benefit when almost all params are frozen.
+        self.deepspeed_config = _envstr("DEEPSPEED_CONFIG", "")
+        # Optimizer selection. The fused AdamW removes per-step kernel-launch
+        # overhead; with LoRA the paged 8-bit variant (bitsandbytes) cuts the
+        # fp32 moment memory 4x, leaving headroom for base-model activations.
+        default_optim = "paged_adamw_8bit" if self.lora_rank > 0 else "adamw_torch_fused"
+        self.optim = _envstr("OPTIM", default_optim)
+        self.torch_compile = _envbool("TORCH_COMPILE", "false")
+        self.resume = _envbool("RESUME", "false")
 
         # Validate required parameters
         self._validate_parameters()
 
     def _validate_parameters(self):
         """Validate required environment variables."""
-        required_params = {
-            "DATASET_LOCAL_DIR": self.dataset_local_dir,
-        }
+        # DATASET_LOCAL_DIR is only required for single-dataset runs; mixture
+        # runs name their datasets via DATASET_PATHS instead.
+        required_params = {}
+        if not self.dataset_paths:
+            required_params["DATASET_LOCAL_DIR"] = self.dataset_local_dir
 
         missing_params = [
             param for param, value in required_params.items() if not value
@@ -126,39 +237,27 @@ class FinetuneWorkflow:
         """
         logger.info("Validating dataset...")
 
+        # Mixture runs name their datasets explicitly via DATASET_PATHS; each
+        # path is existence-checked with resolve(strict=True) at training time,
+        # so an empty DATASET_LOCAL_DIR is not an error here.
+        if self.dataset_paths:
+            logger.info(
+                f"Using {len(self.dataset_paths)} explicit dataset path(s) "
+                "from DATASET_PATHS; skipping local directory validation"
+            )
+            return
+
         # 1) Use explicit local directory if provided and non-empty
         if "DATASET_LOCAL_DIR" in os.environ and os.path.isdir(self.dataset_local_dir):
-            if os.listdir(self.dataset_local_dir):
+            # Probe a single entry instead of materializing the full listing;
+            # on EFS a dataset dir can hold thousands of episode files.
+            with os.scandir(self.dataset_local_dir) as it:
+                has_entries = next(it, None) is not None
+            if has_entries:
                 logger.info(f"Using dataset directory: {self.dataset_local_dir}")
 
-                meta_dir = os.path.join(self.dataset_local_dir, "meta")
-                modality_json_path = os.path.join(meta_dir, "modality.json")
-                if self.data_config == "so100_dualcam" and not os.path.isfile(
-                    modality_json_path
-                ):
-                    os.makedirs(meta_dir, exist_ok=True)
-                    modality_content = {
-                        "state": {
-                            "single_arm": {"start": 0, "end": 5},
-                            "gripper": {"start": 5, "end": 6},
-                        },
-                        "action": {
-                            "single_arm": {"start": 0, "end": 5},
-                            "gripper": {"start": 5, "end": 6},
-                        },
-                        "video": {
-                            "wrist": {"original_key": "observation.images.wrist"},
-                            "front": {"original_key": "observation.images.front"},
-                        },
-                        "annotation": {
-                            "human.task_description": {"original_key": "task_index"}
-                        },
-                    }
-                    with open(modality_json_path, "w") as f:
-                        json.dump(modality_content, f, indent=4)
-                    logger.info(
-                        f"Created missing modality.json at {modality_json_path} for so100_dualcam"
-                    )
+                if self.data_config == "so100_dualcam":
+                    self._ensure_modality_json()
                 return
             else:
                 logger.warning(
@@ -170,35 +269,105 @@ class FinetuneWorkflow:
             "Dataset directory not prepared. Ensure entrypoint script resolved and downloaded the dataset."
         )
 
+    def _ensure_modality_json(self):
+        """Write the default so100_dualcam modality.json if missing or truncated.
+
+        Only rank 0 writes (torchrun workers would otherwise race on shared EFS
+        paths), the write goes through a tmp-file + os.replace() so readers never
+        observe a partial file, and an existing parseable file is left untouched
+        to skip the small-file fsync on every launch.
+        """
+        if int(os.environ.get("LOCAL_RANK", "0")) != 0:
+            return
+
+        meta_dir = os.path.join(self.dataset_local_dir, "meta")
+        modality_json_path = os.path.join(meta_dir, "modality.json")
+        if os.path.isfile(modality_json_path):
+            try:
+                with open(modality_json_path) as f:
+                    existing = json.load(f)
+            except (ValueError, OSError):
+                logger.warning(
+                    f"Existing modality.json at {modality_json_path} is unreadable; rewriting"
+                )
+            else:
+                if existing != _SO100_DUALCAM_MODALITY:
+                    logger.info(
+                        f"Keeping existing modality.json at {modality_json_path}"
+                    )
+                return
+
+        os.makedirs(meta_dir, exist_ok=True)
+        tmp_path = f"{modality_json_path}.tmp.{os.getpid()}"
+        with open(tmp_path, "w") as f:
+            f.write(_SO100_DUALCAM_MODALITY_JSON)
+        os.replace(tmp_path, modality_json_path)
+        logger.info(
+            f"Created modality.json at {modality_json_path} for so100_dualcam"
+        )
+
     def _train_once(self):
         """Run the fine-tuning steps in-process (ported from gr00t_finetune.py)."""
         logger.info("Starting training...")
 
+        import torch
+        from transformers import TrainingArguments
+
+        from gr00t.data.schema import EmbodimentTag
+        from gr00t.experiment.runner import TrainRunner
+        from gr00t.model.gr00t_n1 import GR00T_N1_5
+        from gr00t.utils.peft import get_lora_model
+
+        from gr00t_dataset import ParallelDecodeLeRobotSingleDataset
+
+        # TrainingArguments(tf32=True) only flips the cuDNN flag; the matmul
+        # precision API is separate and controls whether residual fp32 ops in
+        # the DiT head dispatch to TF32 tensor cores. cudnn.benchmark pays off
+        # because robot video batches have fixed input shapes.
+        if torch.cuda.is_available():
+            torch.set_float32_matmul_precision("high")
+            torch.backends.cuda.matmul.allow_tf32 = True
+            torch.backends.cudnn.allow_tf32 = True
+            torch.backends.cudnn.benchmark = True
+
         # ------------ step 1: load dataset ------------
         embodiment_tag = EmbodimentTag(self.embodiment_tag)
 
-        # 1.1 modality configs and transforms
-        data_config_cls = load_data_config(self.data_config)
-        modality_configs = data_config_cls.modality_config()
-        transforms = data_config_cls.transform()
+        # 1.1 modality configs and transforms (cached at module scope)
+        modality_configs, transforms, action_indices = _get_data_cfg(self.data_config)
 
         # 1.2 data loader: we will use either single dataset or mixture dataset
-        dataset_path = [self.dataset_local_dir]
+        dataset_path = self.dataset_paths or [self.dataset_local_dir]
         if len(dataset_path) == 1:
-            train_dataset = LeRobotSingleDataset(
-                dataset_path=os.path.abspath(dataset_path[0]),
+            # resolve(strict=True) gives existence check + absolute path in one
+            # stat, avoiding a per-rank abspath/exists pair on shared EFS.
+            try:
+                resolved_path = str(Path(dataset_path[0]).resolve(strict=True))
+            except FileNotFoundError:
+                raise RuntimeError(
+                    f"Dataset path {dataset_path[0]} does not exist"
+                ) from None
+            train_dataset = ParallelDecodeLeRobotSingleDataset(
+                dataset_path=resolved_path,
                 modality_configs=modality_configs,
                 transforms=transforms,
                 embodiment_tag=embodiment_tag,  # This will override the dataset's embodiment tag to "new_embodiment"
                 video_backend=self.video_backend,
             )
         else:
+            # Mixture support is only pulled in when a mixture is requested;
+            # the import drags in RNG and metadata-config plumbing.
+            from gr00t.data.dataset import LeRobotMixtureDataset
+
             single_datasets = []
             for p in dataset_path:
-                assert os.path.exists(p), f"Dataset path {p} does not exist"
+                try:
+                    p = str(Path(p).resolve(strict=True))
+                except FileNotFoundError:
+                    raise RuntimeError(f"Dataset path {p} does not exist") from None
                 # We use the same transforms, modality configs, and embodiment tag for all datasets here,
                 # in reality, you can use dataset from different modalities and embodiment tags
-                dataset = LeRobotSingleDataset(
+                dataset = ParallelDecodeLeRobotSingleDataset(
                     dataset_path=p,
                     modality_configs=modality_configs,
                     transforms=transforms,
@@ -224,7 +393,7 @@ class FinetuneWorkflow:
 
         # ------------ step 2: load model ------------
         # First, get the data config to determine action horizon
-        data_action_horizon = len(data_config_cls.action_indices)
+        data_action_horizon = len(action_indices)
 
         # Load model
         model = GR00T_N1_5.from_pretrained(
@@ -254,10 +423,14 @@ class FinetuneWorkflow:
             # Create new action head with updated config
             new_action_head = FlowmatchingActionHead(new_action_head_config)
 
-            # Copy the weights from the old action head to the new one
-            new_action_head.load_state_dict(
-                model.action_head.state_dict(), strict=False
-            )
+            # Adopt the old head's weights by reference (assign=True) instead of
+            # element-wise copying every tensor, which transiently doubled the
+            # head's parameter memory after from_pretrained had already placed
+            # the weights. Shape-mismatched params keep their fresh init.
+            with torch.no_grad():
+                new_action_head.load_state_dict(
+                    model.action_head.state_dict(), strict=False, assign=True
+                )
 
             # Replace the action head
             model.action_head = new_action_head
@@ -277,34 +450,73 @@ class FinetuneWorkflow:
         model.compute_dtype = "bfloat16"
         model.config.compute_dtype = "bfloat16"
 
+        # Enable gradient checkpointing to trade compute for activation memory,
+        # which allows larger per-device batch sizes on memory-bound GPUs.
+        if self.gradient_checkpointing:
+            model.gradient_checkpointing_enable(
+                gradient_checkpointing_kwargs={"use_reentrant": False}
+            )
+            if self.lora_rank > 0:
+                # With LoRA the backbone inputs are produced by frozen layers, so
+                # inputs must require grads for autograd to flow through checkpoints.
+                model.enable_input_require_grads()
+
         if self.lora_rank > 0:
+            lora_kwargs = {}
+            if self.lora_target_modules:
+                # Forward the target set only when this gr00t version exposes
+                # it; older pinned commits hardcode the modules in LoraConfig.
+                if "target_modules" in inspect.signature(get_lora_model).parameters:
+                    lora_kwargs["target_modules"] = self.lora_target_modules
+                else:
+                    logger.warning(
+                        "LORA_TARGET_MODULES is set but this gr00t version's "
+                        "get_lora_model does not accept target_modules; ignoring"
+                    )
             model = get_lora_model(
                 model,
                 rank=self.lora_rank,
                 lora_alpha=self.lora_alpha,
                 lora_dropout=self.lora_dropout,
                 action_head_only=not self.lora_full_model,
+                **lora_kwargs,
             )
+            if self.torch_compile:
+                # With LoRA nearly all backbone params are frozen and shapes are
+                # static, so CUDA-graph capture via reduce-overhead recovers the
+                # small-matmul overhead the adapters add. Opt-in: set
+                # TORCH_COMPILE=true (requires fixed-shape batches).
+                model.backbone = torch.compile(
+                    model.backbone,
+                    mode="reduce-overhead",
+                    fullgraph=False,
+                    dynamic=False,
+                )
 
         # 2.1 modify training args
         training_args = TrainingArguments(
             output_dir=self.output_dir,
             run_name=None,
             remove_unused_columns=False,
-            deepspeed="",
-            gradient_checkpointing=False,
+            deepspeed=self.deepspeed_config,
+            gradient_checkpointing=self.gradient_checkpointing,
+            gradient_checkpointing_kwargs=(
+                {"use_reentrant": False} if self.gradient_checkpointing else None
+            ),
             bf16=True,
             tf32=True,
             per_device_train_batch_size=self.batch_size,
             gradient_accumulation_steps=1,
             dataloader_num_workers=self.dataloader_num_workers,
-            dataloader_pin_memory=False,
+            # Pinned host buffers enable async (non_blocking) H2D copies, so worker
+            # output lands in page-locked memory instead of pageable memory.
+            dataloader_pin_memory=self.dataloader_pin_memory,
             dataloader_prefetch_factor=self.dataloader_prefetch_factor,
             dataloader_persistent_workers=self.dataloader_num_workers > 0,
-            optim="adamw_torch",
+            optim=self.optim,
             adam_beta1=0.95,
             adam_beta2=0.999,
-            adam_epsilon=1e-8,
+            adam_epsilon=1e-6,  # larger epsilon for bf16 numerical stability
             learning_rate=self.learning_rate,
             weight_decay=self.weight_decay,
             warmup_ratio=self.warmup_ratio,
@@ -314,13 +526,23 @@ class FinetuneWorkflow:
             max_steps=self.max_steps,
             save_strategy="steps",
             save_steps=self.save_steps,
-            # evaluation_strategy="no",
+            eval_strategy="no",
             save_total_limit=5,
             report_to=self.report_to,
             seed=42,
             do_eval=False,
+            # Keep any future eval forward in bf16; without this the Trainer
+            # upcasts eval passes to fp32, doubling activation memory.
+            bf16_full_eval=True,
+            # Safe because every trainable branch (projector / diffusion head /
+            # LoRA adapters) sees gradients each step; frozen params never enter
+            # the reducer. If a future config leaves a trainable branch out of
+            # the forward pass, flip this to True before chasing DDP hangs.
             ddp_find_unused_parameters=False,
-            ddp_bucket_cap_mb=100,
+            # Fewer, larger NCCL all-reduce launches for the 3B model. The
+            # stable-graph fusion itself (static_graph=True) is not exposed by
+            # TrainingArguments, so bucket sizing is the available lever here.
+            ddp_bucket_cap_mb=300,
             torch_compile_mode=None,
         )
 
@@ -342,6 +564,8 @@ class FinetuneWorkflow:
         # Create output directories (checkpoints and tensorboard logs)
         os.makedirs(self.output_dir, exist_ok=True)
 
+        import torch
+
         available_gpus = torch.cuda.device_count() if torch.cuda.is_available() else 1
 
         # Validate GPU configuration
@@ -367,21 +591,21 @@ class FinetuneWorkflow:
                 if "CUDA_VISIBLE_DEVICES" in os.environ:
                     del os.environ["CUDA_VISIBLE_DEVICES"]
 
-                # Build torchrun args (call torch.distributed.run main directly)
+                # Replace this process with the torchrun binary instead of
+                # calling torch.distributed.run in-process. The launcher would
+                # otherwise sit idle for the whole run holding its own CUDA
+                # context and several GB of imported framework state.
                 args = [
+                    "torchrun",
                     "--standalone",
                     f"--nproc_per_node={self.num_gpus}",
                     "--nnodes=1",
                     str(script_path),
                 ]
 
-                print("Running torchrun with args: ", args)
+                print("Exec'ing torchrun with args: ", args)
                 os.environ["IS_TORCHRUN"] = "1"
-                try:
-                    torchrun(args=args)
-                except SystemExit as e:
-                    code = e.code if isinstance(e.code, int) else 0
-                    sys.exit(code)
+                os.execvp("torchrun", args)
 
     def run_workflow(self):
         """Run the complete workflow."""
@@ -6,6 +6,7 @@ from aws_cdk import (
     aws_iam as iam,
     aws_efs as efs,
     aws_ecs as ecs,
+    aws_logs as logs,
     aws_s3 as s3,
     Stack,
     CfnOutput,
@@ -28,6 +29,16 @@ class BatchStack(Stack):
         ecr_image_uri: str = None,
         dataset_bucket: str = None,
         s3_upload_uri: str = None,
+        efs_throughput_mode: efs.ThroughputMode = efs.ThroughputMode.ELASTIC,
+        efs_provisioned_throughput: Size = None,
+        use_spot: bool = True,
+        spot_bid_percentage: int = 70,
+        s3_accelerate_uploads: bool = False,
+        private_subnet_ids: list = None,
+        availability_zones: list = None,
+        min_vcpus: int = 0,
+        desired_vcpus: int = 0,
+        max_vcpus: int = 192,
         **kwargs,
     ) -> None:
         """
@@ -50,15 +61,56 @@ class BatchStack(Stack):
                           If not provided, builds from local Dockerfile.
             dataset_bucket: S3 bucket name for dataset read-only access (optional)
             s3_upload_uri: S3 URI for checkpoint uploads (e.g., s3://bucket/path). If not provided, creates a new bucket.
+            efs_throughput_mode: EFS throughput mode. Defaults to ELASTIC: sustained
+                          checkpoint writes exhaust BURSTING credits and throttle all
+                          EFS I/O to a few MiB/s per TiB stored.
+            efs_provisioned_throughput: MiB/s (aws_cdk.Size) when efs_throughput_mode
+                          is PROVISIONED; ignored otherwise.
+            use_spot: Run the compute environment on Spot capacity (default True).
+                          Fine-tuning is checkpoint-restartable, so Spot cuts
+                          $/GPU-hour ~3x.
+            spot_bid_percentage: Maximum Spot price as a percentage of on-demand.
+            s3_accelerate_uploads: Route checkpoint uploads through the S3
+                          Transfer Acceleration endpoint. Only worthwhile when
+                          the bucket is in another region: for same-region EC2
+                          uploads acceleration adds no speedup and the traffic
+                          bypasses the S3 gateway endpoint, paying NAT per-GB.
+            private_subnet_ids: Private subnet IDs of the existing VPC. When given
+                          together with availability_zones and vpc_id, the stack
+                          imports the VPC from attributes and skips the
+                          synth-time EC2 describe calls of Vpc.from_lookup.
+            availability_zones: Availability zones matching private_subnet_ids.
+            min_vcpus: Floor for the compute environment. Keep at 0 for batch
+                          workloads; raise for a permanently warm pool.
+            desired_vcpus: Initial warm capacity. Setting this to one instance's
+                          worth (e.g. 8) skips the ~3 min instance boot + image
+                          pull on the next job after idle, at on-demand cost.
+            max_vcpus: Ceiling for the compute environment.
         """
         super().__init__(scope, construct_id, **kwargs)
 
+        # Fallback for callers that instantiate the stack directly rather than
+        # through app.py (which resolves context/env itself).
+        if ecr_image_uri is None:
+            ecr_image_uri = os.getenv("ECR_IMAGE_URI")
+
         # ==============================================================
         # region 2.1 Create VPC and EFS
         # ==============================================================
         # Create or reference VPC. If you already have a VPC, pass its ID; otherwise we
         # create a VPC with one NAT gateway (to match "VPC and more" in the console flow).
-        if vpc_id:
+        if vpc_id and private_subnet_ids and availability_zones:
+            # All attributes known up front: no EC2 describe calls at synth
+            # time (from_lookup hits the API whenever the context cache is
+            # cold, which adds seconds per synth and rate-limits CI).
+            vpc = ec2.Vpc.from_vpc_attributes(
+                self,
+                "BatchVPC",
+                vpc_id=vpc_id,
+                availability_zones=availability_zones,
+                private_subnet_ids=private_subnet_ids,
+            )
+        elif vpc_id:
             vpc = ec2.Vpc.from_lookup(self, "BatchVPC", vpc_id=vpc_id)
         else:
             vpc = ec2.Vpc(
@@ -79,6 +131,28 @@ class BatchStack(Stack):
                         subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS,
                     ),
                 ],
+                # Keep S3 traffic (dataset GETs, checkpoint PUTs) on the AWS
+                # backbone instead of paying per-GB NAT fees for it.
+                gateway_endpoints={
+                    "S3": ec2.GatewayVpcEndpointOptions(
+                        service=ec2.GatewayVpcEndpointAwsService.S3
+                    )
+                },
+            )
+            # PrivateLink endpoints for image pulls and logging: the multi-GB
+            # CUDA container otherwise funnels through the single NAT gateway's
+            # ~5 Gbps per-flow ceiling on every cold instance.
+            vpc.add_interface_endpoint(
+                "EcrApi", service=ec2.InterfaceVpcEndpointAwsService.ECR
+            )
+            vpc.add_interface_endpoint(
+                "EcrDocker", service=ec2.InterfaceVpcEndpointAwsService.ECR_DOCKER
+            )
+            vpc.add_interface_endpoint(
+                "Logs", service=ec2.InterfaceVpcEndpointAwsService.CLOUDWATCH_LOGS
+            )
+            vpc.add_interface_endpoint(
+                "Sts", service=ec2.InterfaceVpcEndpointAwsService.STS
             )
 
         self.vpc = vpc
@@ -105,14 +179,21 @@ class BatchStack(Stack):
                 vpc=vpc,
                 description="Security group for Batch instances and EFS",
             )
+            efs_kwargs = {}
+            if efs_throughput_mode == efs.ThroughputMode.PROVISIONED:
+                efs_kwargs["provisioned_throughput_per_second"] = (
+                    efs_provisioned_throughput
+                )
+            # No explicit performance_mode: ELASTIC requires GENERAL_PURPOSE,
+            # which is also the CDK default.
             efs_fs = efs.FileSystem(
                 self,
                 "BatchEFS",
                 file_system_name="BatchEFS",
                 vpc=vpc,
                 security_group=efs_sg,
-                performance_mode=efs.PerformanceMode.GENERAL_PURPOSE,
-                throughput_mode=efs.ThroughputMode.BURSTING,
+                throughput_mode=efs_throughput_mode,
+                **efs_kwargs,
             )
             # Expose attributes for cross-stack use
             self.efs_id = efs_fs.file_system_id
@@ -135,13 +216,25 @@ class BatchStack(Stack):
         if ecr_image_uri:
             # Use provided ECR image
             # Expected format: <account>.dkr.ecr.<region>.amazonaws.com/<repo>:<tag>
-            repo_and_tag = ecr_image_uri.split("/")[-1]
+            registry, _, repo_and_tag = ecr_image_uri.partition("/")
             if ":" in repo_and_tag:
-                repo_name, tag = repo_and_tag.split(":", 1)
+                repo_name, tag = repo_and_tag.rsplit(":", 1)
             else:
                 repo_name, tag = repo_and_tag, "latest"
-            repo = ecr.Repository.from_repository_name(
-                self, "IsaacGr00tEcrRepo", repository_name=repo_name
+            # Import by ARN so the account/region baked into the URI are
+            # honored; from_repository_name would silently assume the stack's
+            # own account and break cross-account pulls.
+            registry_parts = registry.split(".")
+            if len(registry_parts) >= 6 and registry_parts[1:3] == ["dkr", "ecr"]:
+                repo_account, repo_region = registry_parts[0], registry_parts[3]
+            else:
+                repo_account, repo_region = self.account, self.region
+            repo = ecr.Repository.from_repository_arn(
+                self,
+                "IsaacGr00tEcrRepo",
+                repository_arn=(
+                    f"arn:aws:ecr:{repo_region}:{repo_account}:repository/{repo_name}"
+                ),
             )
             container_image = ecs.ContainerImage.from_ecr_repository(
                 repository=repo, tag=tag
@@ -156,31 +249,87 @@ class BatchStack(Stack):
                 ecr_repository_name="gr00t-finetune",
                 use_stable=True,
             )
-            # Use the built image
+            # Use the built image at its content-hash tag
             container_image = ecs.ContainerImage.from_ecr_repository(
-                repository=codebuild_stack.ecr_repository, tag="latest"
+                repository=codebuild_stack.ecr_repository,
+                tag=codebuild_stack.image_tag,
             )
             ecr_image_uri = codebuild_stack.image_uri
 
         # Store codebuild_stack for conditional outputs later
         self.codebuild_stack = codebuild_stack
+        # Resolved image URI (provided or CodeBuild-produced) for siblings
+        # like the DCV stack that pre-pull the image
+        self.ecr_image_uri = ecr_image_uri
         # endregion
 
         # ==============================================================
         # region 2.3 Create Launch Template
         # ==============================================================
-        # Increase the Linux root volume size to 100 GiB for pulling docker containers.
+        # Tune the instance for dataset I/O and image pulls before any job
+        # lands on it. Note: do not append a second [mount] section to
+        # /etc/amazon/efs/efs-utils.conf — the AMI already ships one and
+        # efs-utils parses the file with a strict ConfigParser, so a duplicate
+        # section makes every mount.efs invocation fail.
+        lt_user_data = ec2.UserData.for_linux()
+        lt_user_data.add_commands(
+            # (a) Larger NFS readahead for sequential dataset scans.
+            "echo 'ACTION==\"add\", SUBSYSTEM==\"bdi\", KERNEL==\"*:*\", ATTR{read_ahead_kb}=\"4096\"' > /etc/udev/rules.d/99-nfs.rules",
+            "udevadm control --reload",
+            # FS-Cache/cachefilesd is intentionally absent: it only engages on
+            # mounts made with the fsc option, and ECS EFSVolumeConfiguration
+            # offers no way to pass custom mount options to the job volumes.
+            # (b) g6e instances ship local NVMe instance store. Put the Docker
+            # data root there so multi-GB image pulls and container-layer I/O
+            # hit local flash instead of the EBS root volume. dockerd may
+            # already be up by the time user data runs, so stop it before
+            # swapping the data root out from under it and restart it after —
+            # the pre-pull below and the first job need a daemon that actually
+            # writes to the NVMe mount.
+            "NVME_DEV=$(lsblk -dpno NAME,MODEL | awk '/Instance Storage/ {print $1; exit}')",
+            'if [ -n "$NVME_DEV" ]; then',
+            "  systemctl stop docker 2>/dev/null || true",
+            "  mkfs.xfs -f $NVME_DEV",
+            "  mkdir -p /var/lib/docker",
+            "  mount -o noatime $NVME_DEV /var/lib/docker",
+            "  systemctl start docker 2>/dev/null || true",
+            "fi",
+            # (c) Reuse cached image layers across jobs and keep stopped-task
+            # layers around for an hour so the second+ job on an instance
+            # skips the multi-GB pull entirely.
+            'echo "ECS_IMAGE_PULL_BEHAVIOR=prefer-cached" >> /etc/ecs/ecs.config',
+            'echo "ECS_ENGINE_TASK_CLEANUP_WAIT_DURATION=1h" >> /etc/ecs/ecs.config',
+            # (d) Warm the cache in the background during instance init so the
+            # first job's container start overlaps with instance registration
+            # instead of serializing behind it.
+            f'IMAGE_URI="{ecr_image_uri}"',
+            'REGISTRY="${IMAGE_URI%%/*}"',
+            f"(aws ecr get-login-password --region {self.region}"
+            ' | docker login --username AWS --password-stdin "$REGISTRY"'
+            ' && docker pull "$IMAGE_URI") &',
+        )
+        # Batch requires launch template user data in MIME multipart form.
+        lt_multipart_user_data = ec2.MultipartUserData()
+        lt_multipart_user_data.add_part(ec2.MultipartBody.from_user_data(lt_user_data))
+
+        # Larger, faster root volume: 200 GiB gp3 provisioned well above the
+        # 3000 IOPS / 125 MiB/s baseline so image extraction isn't
+        # bottlenecked on EBS when an instance type has no local NVMe.
         launch_template = ec2.LaunchTemplate(
             self,
             "BatchLaunchTemplate",
             launch_template_name="BatchLaunchTemplate",
+            user_data=lt_multipart_user_data,
+            require_imdsv2=True,
             block_devices=[
                 ec2.BlockDevice(
                     device_name="/dev/xvda",  # standard root device for Amazon Linux 2
                     volume=ec2.BlockDeviceVolume.ebs(
-                        volume_size=100,
+                        volume_size=200,
                         delete_on_termination=True,
                         volume_type=ec2.EbsDeviceVolumeType.GP3,
+                        iops=6000,
+                        throughput=500,
                     ),
                 )
             ],
@@ -191,6 +340,38 @@ class BatchStack(Stack):
         # region 2.4 Create Compute Environment
         # ==============================================================
         # IAM role for Batch EC2 instances so they can pull images, mount EFS, access S3, etc.
+        # Roles deliberately have no role_name: CDK-generated physical names let
+        # CloudFormation replace them in place instead of delete-then-create.
+        instance_role = iam.Role(
+            self,
+            "BatchInstanceRole",
+            assumed_by=iam.ServicePrincipal("ec2.amazonaws.com"),
+            managed_policies=[
+                iam.ManagedPolicy.from_aws_managed_policy_name(
+                    "service-role/AmazonEC2ContainerServiceforEC2Role"
+                ),
+                iam.ManagedPolicy.from_aws_managed_policy_name(
+                    "AmazonSSMManagedInstanceCore"
+                ),
+            ],
+        )
+
+        instance_types = [
+            # By default, limit to g6e family for cost savings
+            # Single-GPU instances
+            ec2.InstanceType("g6e.2xlarge"),
+            ec2.InstanceType("g6e.4xlarge"),
+            ec2.InstanceType("g6e.8xlarge"),
+            # ec2.InstanceType("g6e.16xlarge"),
+            # ec2.InstanceType("p5.4xlarge"),
+            # Multi-GPU instances
+            ec2.InstanceType("g6e.12xlarge"),  # 4 GPUs
+            # ec2.InstanceType("g6e.24xlarge"),  # 4 GPUs
+            ec2.InstanceType("g6e.48xlarge"),  # 8 GPUs
+            # ec2.InstanceType("p4d.24xlarge"),  # 8 GPUs
+            # ec2.InstanceType("p5.48xlarge"),  # 8 GPUs
+        ]
+
         compute_env = batch.ManagedEc2EcsComputeEnvironment(
             self,
             "ComputeEnvironment",
@@ -201,40 +382,49 @@ class BatchStack(Stack):
             ),  # Jobs run in private subnets
             launch_template=launch_template,
             security_groups=[efs_sg],
-            instance_types=[
-                # By default, limit to g6e family for cost savings
-                # Single-GPU instances
-                ec2.InstanceType("g6e.2xlarge"),
-                ec2.InstanceType("g6e.4xlarge"),
-                ec2.InstanceType("g6e.8xlarge"),
-                # ec2.InstanceType("g6e.16xlarge"),
-                # ec2.InstanceType("p5.4xlarge"),
-                # Multi-GPU instances
-                ec2.InstanceType("g6e.12xlarge"),  # 4 GPUs
-                # ec2.InstanceType("g6e.24xlarge"),  # 4 GPUs
-                ec2.InstanceType("g6e.48xlarge"),  # 8 GPUs
-                # ec2.InstanceType("p4d.24xlarge"),  # 8 GPUs
-                # ec2.InstanceType("p5.48xlarge"),  # 8 GPUs
-            ],
-            minv_cpus=0,
-            maxv_cpus=192,
-            instance_role=iam.Role(
-                self,
-                "BatchInstanceRole",
-                assumed_by=iam.ServicePrincipal("ec2.amazonaws.com"),
-                managed_policies=[
-                    iam.ManagedPolicy.from_aws_managed_policy_name(
-                        "service-role/AmazonEC2ContainerServiceforEC2Role"
-                    ),
-                    iam.ManagedPolicy.from_aws_managed_policy_name(
-                        "AmazonSSMManagedInstanceCore"
-                    ),
-                ],
+            instance_types=instance_types,
+            minv_cpus=min_vcpus,
+            maxv_cpus=max_vcpus,
+            # Spot with capacity-optimized allocation picks the deepest pools,
+            # which also lowers interruption frequency vs lowest-price.
+            spot=use_spot,
+            spot_bid_percentage=spot_bid_percentage if use_spot else None,
+            allocation_strategy=(
+                batch.AllocationStrategy.SPOT_CAPACITY_OPTIMIZED
+                if use_spot
+                else batch.AllocationStrategy.BEST_FIT_PROGRESSIVE
             ),
-            # Uncomment for cost-optimized runs on Spot
-            # spot=True,
-            # spot_bid_percentage=70,
+            update_to_latest_image_version=True,
+            instance_role=instance_role,
         )
+        if desired_vcpus > 0:
+            # The L2 construct doesn't expose DesiredvCpus; set it on the
+            # underlying CfnComputeEnvironment so the pool starts warm.
+            compute_env.node.default_child.add_property_override(
+                "ComputeResources.DesiredvCpus", desired_vcpus
+            )
+
+        # When the primary CE runs on Spot, keep an on-demand CE behind it so
+        # jobs still schedule (at order 2) during prolonged GPU Spot droughts.
+        fallback_env = None
+        if use_spot:
+            fallback_env = batch.ManagedEc2EcsComputeEnvironment(
+                self,
+                "OnDemandComputeEnvironment",
+                compute_environment_name="IsaacGr00tOnDemandComputeEnvironment",
+                vpc=vpc,
+                vpc_subnets=ec2.SubnetSelection(
+                    subnet_type=ec2.SubnetType.PRIVATE_WITH_EGRESS
+                ),
+                launch_template=launch_template,
+                security_groups=[efs_sg],
+                instance_types=instance_types,
+                minv_cpus=0,
+                maxv_cpus=max_vcpus,
+                allocation_strategy=batch.AllocationStrategy.BEST_FIT_PROGRESSIVE,
+                update_to_latest_image_version=True,
+                instance_role=instance_role,
+            )
 
         # No explicit allow needed beyond the SG rule above since EFS and instances share the SG.
         # endregion
@@ -242,15 +432,24 @@ class BatchStack(Stack):
         # ==============================================================
         # region 2.5 Create Job Queue and Job Definition
         # ==============================================================
+        # Batch tries compute environments in order, so Spot capacity is used
+        # first and on-demand only absorbs the overflow. A fairshare scheduling
+        # policy is unnecessary here: the queue serves a single workload type,
+        # so FIFO within the queue is the intended behavior.
+        ordered_envs = [
+            batch.OrderedComputeEnvironment(compute_environment=compute_env, order=1)
+        ]
+        if fallback_env is not None:
+            ordered_envs.append(
+                batch.OrderedComputeEnvironment(
+                    compute_environment=fallback_env, order=2
+                )
+            )
         job_queue = batch.JobQueue(
             self,
             "JobQueue",
             job_queue_name="IsaacGr00tJobQueue",
-            compute_environments=[
-                batch.OrderedComputeEnvironment(
-                    compute_environment=compute_env, order=1
-                )
-            ],
+            compute_environments=ordered_envs,
             priority=1,
         )
 
@@ -267,14 +466,14 @@ class BatchStack(Stack):
         # 2) If s3_upload_uri is provided (e.g., s3://bucket/path), allow read/write to its bucket/prefix.
         # 3) If s3_upload_uri is not provided, create a new checkpoint bucket and derive s3_upload_uri.
         # 4) If neither dataset nor upload buckets are specified, fall back to S3 read-only (useful for dataset downloads).
+        # Collect bucket ARNs and statements first, then attach a single inline
+        # policy: repeated add_to_policy calls grow the role's policy document
+        # one statement at a time.
+        list_bucket_arns = []
+        s3_statements = []
         if dataset_bucket:
-            job_role.add_to_policy(
-                iam.PolicyStatement(
-                    actions=["s3:ListBucket"],
-                    resources=[f"arn:aws:s3:::{dataset_bucket}"],
-                )
-            )
-            job_role.add_to_policy(
+            list_bucket_arns.append(f"arn:aws:s3:::{dataset_bucket}")
+            s3_statements.append(
                 iam.PolicyStatement(
                     actions=["s3:GetObject"],
                     resources=[f"arn:aws:s3:::{dataset_bucket}/*"],
@@ -293,8 +492,27 @@ class BatchStack(Stack):
                 encryption=s3.BucketEncryption.S3_MANAGED,
                 enforce_ssl=True,
                 versioned=True,
+                transfer_acceleration=True,
                 removal_policy=RemovalPolicy.RETAIN,
                 auto_delete_objects=False,
+                # Checkpoints are overwritten every SAVE_STEPS; without a
+                # lifecycle policy every superseded version sits in Standard
+                # forever and failed multipart uploads keep their parts.
+                lifecycle_rules=[
+                    s3.LifecycleRule(
+                        noncurrent_version_expiration=Duration.days(14),
+                        transitions=[
+                            s3.Transition(
+                                storage_class=s3.StorageClass.INTELLIGENT_TIERING,
+                                transition_after=Duration.days(0),
+                            )
+                        ],
+                        abort_incomplete_multipart_upload_after=Duration.days(1),
+                    )
+                ],
+                intelligent_tiering_configurations=[
+                    s3.IntelligentTieringConfiguration(name="all")
+                ],
             )
             # Derive s3_upload_uri from the created bucket
             s3_upload_uri = f"s3://{checkpoint_bucket.bucket_name}/gr00t/checkpoints"
@@ -308,18 +526,13 @@ class BatchStack(Stack):
                 upload_bucket, upload_prefix = remainder.split("/", 1)
             else:
                 upload_bucket, upload_prefix = remainder, ""
-            job_role.add_to_policy(
-                iam.PolicyStatement(
-                    actions=["s3:ListBucket"],
-                    resources=[f"arn:aws:s3:::{upload_bucket}"],
-                )
-            )
+            list_bucket_arns.append(f"arn:aws:s3:::{upload_bucket}")
             object_resource = (
                 f"arn:aws:s3:::{upload_bucket}/{upload_prefix}*"
                 if upload_prefix
                 else f"arn:aws:s3:::{upload_bucket}/*"
             )
-            job_role.add_to_policy(
+            s3_statements.append(
                 iam.PolicyStatement(
                     actions=[
                         "s3:GetObject",
@@ -332,6 +545,22 @@ class BatchStack(Stack):
                 )
             )
 
+        # Emit one AWS::IAM::Policy for all collected S3 access. Bucket-level
+        # actions share a statement; object-level actions stay split so the
+        # dataset bucket remains read-only.
+        if list_bucket_arns:
+            s3_statements.insert(
+                0,
+                iam.PolicyStatement(
+                    actions=["s3:ListBucket", "s3:GetBucketLocation"],
+                    resources=list_bucket_arns,
+                ),
+            )
+        if s3_statements:
+            job_role.attach_inline_policy(
+                iam.Policy(self, "JobRoleS3Policy", statements=s3_statements)
+            )
+
         # Only grant general S3 read-only access if no buckets were originally specified
         if (
             not dataset_bucket
@@ -351,59 +580,116 @@ class BatchStack(Stack):
         # Prepare container environment with defaults and optional S3 settings
         container_environment = {
             # Optional default locations on EFS. You can override at submit time.
-            "OUTPUT_DIR": "/mnt/efs/gr00t/checkpoints"
+            "OUTPUT_DIR": "/mnt/efs/gr00t/checkpoints",
+            # S3 transfer tuning consumed by the entrypoint before `aws s3 sync`:
+            # 64 parallel 64 MiB parts saturate the instance NIC on large
+            # checkpoint uploads, vs the CLI default of 10 x 8 MiB.
+            "S3_MAX_CONCURRENCY": "64",
+            "S3_MULTIPART_CHUNKSIZE": "67108864",
+            "S3_MULTIPART_THRESHOLD": "67108864",
+            "AWS_S3_ADDRESSING_STYLE": "virtual",
         }
         if s3_upload_uri:
             container_environment["UPLOAD_TARGET"] = "s3"
             container_environment["S3_UPLOAD_URI"] = s3_upload_uri
+        if s3_accelerate_uploads:
+            # Opt-in only: the created bucket lives in the stack's own region,
+            # where the accelerate endpoint adds no speedup and the traffic
+            # bypasses the S3 gateway endpoint (NAT per-GB charges). The
+            # bucket keeps acceleration enabled so cross-region deployments
+            # can flip this flag without touching the bucket.
+            container_environment["S3_USE_ACCELERATE_ENDPOINT"] = "true"
+        if use_spot:
+            # Checkpoint more often on Spot so a reclaim loses at most ~500
+            # steps of work; jobs resume from EFS via RESUME=true.
+            container_environment["SAVE_STEPS"] = "500"
 
-        job_def = batch.EcsJobDefinition(
+        # One job definition per instance size so the requested vCPU/memory fit
+        # the g6e host snugly and Batch bin-packs exactly one job per instance.
+        # shared_memory_size grows with GPU count: dataloader workers pass
+        # decoded video frames through /dev/shm, and NCCL uses it for
+        # intra-node collectives.
+        # Single log group with bounded retention; NON_BLOCKING mode keeps the
+        # training loop from stalling on stdout when CloudWatch throttles.
+        job_log_group = logs.LogGroup(
             self,
-            "IsaacGr00tJobDefinition",
-            job_definition_name="IsaacGr00tJobDefinition",
-            container=batch.EcsEc2ContainerDefinition(
+            "JobLogs",
+            retention=logs.RetentionDays.TWO_WEEKS,
+            removal_policy=RemovalPolicy.DESTROY,
+        )
+
+        def _make_job_definition(num_gpus: int, cpu: int, memory_gib: int):
+            suffix = "" if num_gpus == 1 else f"{num_gpus}Gpu"
+            environment = dict(container_environment)
+            environment["NUM_GPUS"] = str(num_gpus)
+            return batch.EcsJobDefinition(
                 self,
-                "IsaacGr00tContainer",
-                image=container_image,
-                memory=Size.gibibytes(64),
-                cpu=8,
-                gpu=1,
-                job_role=job_role,
-                environment=container_environment,
-                volumes=[efs_volume],
-                linux_parameters=batch.LinuxParameters(
+                f"IsaacGr00t{suffix}JobDefinition",
+                job_definition_name=f"IsaacGr00t{suffix}JobDefinition",
+                container=batch.EcsEc2ContainerDefinition(
                     self,
-                    "IsaacGr00tLinuxParameters",
-                    shared_memory_size=Size.gibibytes(64),
+                    f"IsaacGr00t{suffix}Container",
+                    image=container_image,
+                    memory=Size.gibibytes(memory_gib),
+                    cpu=cpu,
+                    gpu=num_gpus,
+                    job_role=job_role,
+                    environment=environment,
+                    volumes=[efs_volume],
+                    logging=ecs.LogDriver.aws_logs(
+                        stream_prefix="gr00t",
+                        log_group=job_log_group,
+                        mode=ecs.AwsLogDriverMode.NON_BLOCKING,
+                        max_buffer_size=Size.mebibytes(25),
+                    ),
+                    linux_parameters=batch.LinuxParameters(
+                        self,
+                        f"IsaacGr00t{suffix}LinuxParameters",
+                        shared_memory_size=Size.gibibytes(64 * num_gpus),
+                    ),
                 ),
-            ),
-            timeout=Duration.hours(6),
-        )
+                timeout=Duration.hours(6),
+            )
+
+        # Sized for g6e.2xlarge / g6e.12xlarge / g6e.48xlarge respectively.
+        # ECS registers a few GiB less than the instance's physical memory
+        # (agent + OS reservation), so the request must sit below the
+        # registered value — asking for the full 64/384/768 GiB makes the
+        # target instance unplaceable and Batch silently bumps the job to the
+        # next size up, idling most of its GPUs.
+        job_def = _make_job_definition(num_gpus=1, cpu=8, memory_gib=60)
+        job_def_4gpu = _make_job_definition(num_gpus=4, cpu=48, memory_gib=370)
+        job_def_8gpu = _make_job_definition(num_gpus=8, cpu=96, memory_gib=760)
         # endregion
 
         # ==============================================================
         # region Outputs
         # ==============================================================
-        CfnOutput(self, "VpcId", value=self.vpc.vpc_id)
-        CfnOutput(self, "EFSFileSystemId", value=self.efs_id)
-        CfnOutput(self, "EFSSecurityGroupId", value=self.efs_sg_id)
-
-        # Additional outputs for convenience when submitting jobs via CLI/Console
-        CfnOutput(
-            self, "ComputeEnvironmentName", value=compute_env.compute_environment_name
-        )
-        CfnOutput(self, "JobQueueName", value=job_queue.job_queue_name)
-        CfnOutput(self, "JobDefinitionName", value=job_def.job_definition_name)
-        CfnOutput(self, "EcrImageUri", value=ecr_image_uri)
-        if s3_upload_uri:
-            CfnOutput(self, "CheckpointS3UploadUri", value=s3_upload_uri)
-
-        # CodeBuild outputs (only when CodeBuild is used)
-        if codebuild_stack:
-            CfnOutput(
-                self,
-                "CodeBuildProjectName",
-                value=codebuild_stack.build_project.project_name,
-                description="CodeBuild project name for building the container",
-            )
+        # Dict-driven outputs: one place to add entries, None values are
+        # skipped (e.g. CodeBuild outputs when a pre-built image is used), and
+        # every output gets an export name for cross-stack Fn::ImportValue.
+        outputs = {
+            "VpcId": self.vpc.vpc_id,
+            "EFSFileSystemId": self.efs_id,
+            "EFSSecurityGroupId": self.efs_sg_id,
+            # Convenience values for submitting jobs via CLI/Console
+            "ComputeEnvironmentName": compute_env.compute_environment_name,
+            "JobQueueName": job_queue.job_queue_name,
+            "JobDefinitionName": job_def.job_definition_name,
+            "JobDefinition4GpuName": job_def_4gpu.job_definition_name,
+            "JobDefinition8GpuName": job_def_8gpu.job_definition_name,
+            "JobLogGroupName": job_log_group.log_group_name,
+            "EcrImageUri": ecr_image_uri,
+            "CheckpointS3UploadUri": s3_upload_uri or None,
+            "CodeBuildProjectName": (
+                codebuild_stack.build_project.project_name
+                if codebuild_stack
+                else None
+            ),
+        }
+        for name, value in outputs.items():
+            if value is not None:
+                CfnOutput(
+                    self, name, value=value, export_name=f"{self.stack_name}-{name}"
+                )
         # endregion
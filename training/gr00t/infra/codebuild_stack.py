@@ -19,6 +19,13 @@ class CodeBuildStack(Construct):
         construct_id: str,
         ecr_repository_name: str = "gr00t-finetune",
         use_stable: bool = True,
+        github_owner: str = None,
+        github_repo: str = None,
+        github_branch: str = "main",
+        auto_trigger: bool = True,
+        shared_source_asset: s3_assets.Asset = None,
+        compute_type: codebuild.ComputeType = codebuild.ComputeType.X2_LARGE,
+        verbose_outputs: bool = False,
     ) -> None:
         """
         CDK construct for AWS CodeBuild project to build GR00T fine-tuning container.
@@ -32,6 +39,29 @@ class CodeBuildStack(Construct):
         Args:
             ecr_repository_name: Name for the ECR repository (default: gr00t-finetune)
             use_stable: Use stable GR00T commit vs latest (default: True)
+            github_owner: GitHub org/user to pull source from. With github_repo
+                          set, CodeBuild does a shallow clone directly and
+                          cdk deploy skips the zip/hash/upload of the local
+                          tree entirely. The repo must contain the contents of
+                          training/gr00t/ at its root and be linked to
+                          CodeBuild via an OAuth/app connection.
+            github_repo: GitHub repository name (see github_owner)
+            github_branch: Branch to build when using GitHub source
+            auto_trigger: Start a build automatically on stack create/update
+            shared_source_asset: Reuse an asset created elsewhere in the app
+                          instead of zipping and uploading the tree again
+                          (exposed as self.source_asset for siblings)
+            compute_type: CodeBuild fleet size. The flash-attn compile is
+                          CPU-bound and parallelized with nproc jobs, so the
+                          72-vCPU X2_LARGE default cuts the compile roughly
+                          linearly vs LARGE's 8 vCPUs; pass LARGE to trade
+                          build time for a cheaper fleet. Must stay x86:
+                          flash-attn targets CUDA/x86_64, so Graviton
+                          (ARM) fleets cannot build this image.
+            verbose_outputs: Also emit human-convenience outputs (the
+                          start-build command) in addition to the essential
+                          ones; off by default to keep templates and
+                          change sets small
         """
         super().__init__(scope, construct_id)
 
@@ -58,31 +88,79 @@ class CodeBuildStack(Construct):
         # ==============================================================
         # 2. Source Code Asset
         # ==============================================================
-        # Package the local source code and upload to a CDK managed S3 bucket
-        # CodeBuild will download from S3 to build the container
-        asset_path = os.path.abspath(
-            os.path.join(os.path.dirname(__file__), "..")
-        )  # training/gr00t/
-        source_asset = s3_assets.Asset(
+        # Default: package the local source code and upload to a CDK managed
+        # S3 bucket; CodeBuild downloads from S3 to build the container.
+        # With github_owner/github_repo set, CodeBuild shallow-clones the repo
+        # itself and the per-deploy asset zip/hash/upload is skipped.
+        source_asset = shared_source_asset
+        if source_asset is None and not (github_owner and github_repo):
+            asset_path = os.path.abspath(
+                os.path.join(os.path.dirname(__file__), "..")
+            )  # training/gr00t/
+            # CDK's default content hashing walks the asset directory but
+            # honors the exclude list below, so doc-only edits leave the hash
+            # (and the image tag derived from it) unchanged. A git tree hash
+            # would be cheaper to compute but covers the whole directory,
+            # excludes included, and rolled the image tag on every doc commit.
+            source_asset = s3_assets.Asset(
+                self,
+                "IsaacGr00tSourceAsset",
+                path=asset_path,
+                exclude=[
+                    ".git",
+                    ".gitignore",
+                    "*.pyc",
+                    "__pycache__",
+                    "cdk.context.json",
+                    ".venv",
+                    "venv",
+                    "*.egg-info",
+                    ".pytest_cache",
+                    ".mypy_cache",
+                    "cdk.out",
+                    "infra/.cdk.staging",
+                    # Not part of the container build; excluding them keeps the
+                    # asset hash (and thus the image tag) stable when only docs
+                    # or notebooks change
+                    "*.ipynb",
+                    "*.md",
+                    "*.log",
+                    ".env",
+                    ".env.*",
+                ],
+            )
+
+        # Second repository holding the BuildKit registry cache. This is the
+        # persistent cross-host build cache: CodeBuild's local layer cache is
+        # evicted within ~15-60 min of idle, so daily builds started cold and
+        # re-paid the full flash-attn compile. An S3 project cache is not an
+        # alternative here — Cache.bucket() only persists the paths listed
+        # under cache: in the buildspec and cannot capture Docker layers — so
+        # the registry cache is the single mechanism. BuildKit fetches only
+        # the blobs it needs from it.
+        cache_repo = ecr.Repository(
             self,
-            "IsaacGr00tSourceAsset",
-            path=asset_path,
-            exclude=[
-                ".git",
-                ".gitignore",
-                "*.pyc",
-                "__pycache__",
-                "cdk.context.json",
-                ".venv",
-                "venv",
-                "*.egg-info",
-                ".pytest_cache",
-                ".mypy_cache",
-                "cdk.out",
-                "infra/.cdk.staging",
+            "IsaacGr00tEcrCacheRepository",
+            repository_name=f"{ecr_repository_name}-cache",
+            removal_policy=RemovalPolicy.DESTROY,
+            lifecycle_rules=[
+                ecr.LifecycleRule(
+                    description="Keep last 5 cache manifests",
+                    max_image_count=5,
+                    rule_priority=1,
+                )
             ],
         )
 
+        # Tag images by source content hash instead of "latest". A mutable
+        # :latest tag races concurrent builds against job pulls, and CFN can't
+        # tell the job definition changed when the image does. The asset hash
+        # only moves when the source does, so the job definition rolls exactly
+        # when a new image exists and ECS reuses cached layers otherwise.
+        # With a GitHub source there is no synth-time content hash; those
+        # builds fall back to the mutable latest tag.
+        image_tag = source_asset.asset_hash[:16] if source_asset else "latest"
+
         # ==============================================================
         # 3. CodeBuild Project
         # ==============================================================
@@ -92,17 +170,27 @@ class CodeBuildStack(Construct):
             "IsaacGr00tContainerBuild",
             project_name="IsaacGr00tContainerBuild",
             description="Build GR00T fine-tuning container and push to ECR",
-            # Source: Use the S3 asset created above
-            # Customize the source to use your own Git repository
-            source=codebuild.Source.s3(
-                bucket=source_asset.bucket,
-                path=source_asset.s3_object_key,
+            # Source: S3 asset by default, direct shallow git clone when a
+            # GitHub repo is configured
+            source=(
+                codebuild.Source.git_hub(
+                    owner=github_owner,
+                    repo=github_repo,
+                    branch_or_ref=github_branch,
+                    clone_depth=1,
+                    webhook=False,
+                )
+                if github_owner and github_repo
+                else codebuild.Source.s3(
+                    bucket=source_asset.bucket,
+                    path=source_asset.s3_object_key,
+                )
             ),
             # Build environment
             environment=codebuild.BuildEnvironment(
                 # Use x86_64 architecture (required for EC2 G6e, P4 and P5 instances)
                 build_image=codebuild.LinuxBuildImage.STANDARD_7_0,  # Ubuntu 22.04, Docker 24
-                compute_type=codebuild.ComputeType.LARGE,  # 8 vCPU, 15 GB RAM
+                compute_type=compute_type,  # X2_LARGE (72 vCPU) by default
                 privileged=True,  # Required for Docker builds
             ),
             # Build specification (located in infra/ directory)
@@ -115,15 +203,17 @@ class CodeBuildStack(Construct):
                 "USE_STABLE": codebuild.BuildEnvironmentVariable(
                     value="true" if use_stable else "false"
                 ),
-                "IMAGE_TAG": codebuild.BuildEnvironmentVariable(value="latest"),
+                "IMAGE_TAG": codebuild.BuildEnvironmentVariable(value=image_tag),
+                "CACHE_IMAGE_URI": codebuild.BuildEnvironmentVariable(
+                    value=cache_repo.repository_uri
+                ),
+                "DOCKER_BUILDKIT": codebuild.BuildEnvironmentVariable(value="1"),
             },
             # Timeout (building flash-attn takes time)
             timeout=Duration.hours(2),
-            # Cache for faster rebuilds (optional)
-            cache=codebuild.Cache.local(
-                codebuild.LocalCacheMode.DOCKER_LAYER,
-                codebuild.LocalCacheMode.CUSTOM,
-            ),
+            # Local layer cache still helps back-to-back builds on a warm
+            # host; cold hosts seed from the ECR registry cache instead.
+            cache=codebuild.Cache.local(codebuild.LocalCacheMode.DOCKER_LAYER),
         )
 
         # ==============================================================
@@ -131,9 +221,11 @@ class CodeBuildStack(Construct):
         # ==============================================================
         # Grant CodeBuild permissions to push to ECR
         ecr_repo.grant_pull_push(build_project.role)
+        cache_repo.grant_pull_push(build_project.role)
 
         # Grant permissions to read source from S3
-        source_asset.grant_read(build_project.role)
+        if source_asset:
+            source_asset.grant_read(build_project.role)
 
         # Add ECR authorization token permission (required for docker login)
         build_project.role.add_to_policy(
@@ -149,48 +241,60 @@ class CodeBuildStack(Construct):
         # Automatically trigger a CodeBuild build when the stack is created or updated
         # The build triggers when files in the asset path change because the physical
         # resource ID includes the asset hash, which changes when source files change
-        trigger_build = cr.AwsCustomResource(
-            self,
-            "AutoTriggerBuild",
-            # Use from_sdk_calls for simpler policy management
-            # This automatically grants the necessary permissions for the SDK call
-            policy=cr.AwsCustomResourcePolicy.from_sdk_calls(
-                resources=cr.AwsCustomResourcePolicy.ANY_RESOURCE
-            ),
-            # Lambda timeout should be minimal - it just triggers the build, doesn't wait for completion
-            timeout=Duration.minutes(5),
-            # Trigger on both CREATE and UPDATE
-            # The physical resource ID includes the asset's S3 object key hash, so it changes when files change
-            on_create=cr.AwsSdkCall(
-                service="CodeBuild",
-                action="startBuild",
-                parameters={
-                    "projectName": build_project.project_name,
-                },
-                # Use S3 object key hash in physical resource ID so it changes when files change
-                # The s3_object_key contains a hash that changes when asset contents change
-                # This ensures builds trigger on every deploy when source files are modified
-                physical_resource_id=cr.PhysicalResourceId.of(
-                    f"{build_project.project_name}-build-{source_asset.s3_object_key}"
+        # (for GitHub sources the fingerprint is the branch, so only CREATE triggers)
+        source_fingerprint = (
+            source_asset.s3_object_key
+            if source_asset
+            else f"{github_owner}-{github_repo}-{github_branch}"
+        )
+        if auto_trigger:
+            trigger_build = cr.AwsCustomResource(
+                self,
+                "AutoTriggerBuild",
+                # Scope the Lambda's policy to exactly the one call it makes
+                policy=cr.AwsCustomResourcePolicy.from_statements(
+                    [
+                        iam.PolicyStatement(
+                            actions=["codebuild:StartBuild"],
+                            resources=[build_project.project_arn],
+                        )
+                    ]
                 ),
-            ),
-            # Also trigger on UPDATE when the physical resource ID changes (i.e., when asset hash changes)
-            on_update=cr.AwsSdkCall(
-                service="CodeBuild",
-                action="startBuild",
-                parameters={
-                    "projectName": build_project.project_name,
-                },
-                # Use the same dynamic physical resource ID based on S3 object key hash
-                physical_resource_id=cr.PhysicalResourceId.of(
-                    f"{build_project.project_name}-build-{source_asset.s3_object_key}"
+                # Lambda timeout should be minimal - it just triggers the build, doesn't wait for completion
+                timeout=Duration.minutes(5),
+                # Trigger on both CREATE and UPDATE
+                # The physical resource ID includes the asset's S3 object key hash, so it changes when files change
+                on_create=cr.AwsSdkCall(
+                    service="CodeBuild",
+                    action="startBuild",
+                    parameters={
+                        "projectName": build_project.project_name,
+                    },
+                    # Use S3 object key hash in physical resource ID so it changes when files change
+                    # The s3_object_key contains a hash that changes when asset contents change
+                    # This ensures builds trigger on every deploy when source files are modified
+                    physical_resource_id=cr.PhysicalResourceId.of(
+                        f"{build_project.project_name}-build-{source_fingerprint}"
+                    ),
                 ),
-            ),
-            # Install latest AWS SDK in Lambda runtime for latest API support
-            install_latest_aws_sdk=True,
-        )
-        # Ensure the build project exists before triggering
-        trigger_build.node.add_dependency(build_project)
+                # Also trigger on UPDATE when the physical resource ID changes (i.e., when asset hash changes)
+                on_update=cr.AwsSdkCall(
+                    service="CodeBuild",
+                    action="startBuild",
+                    parameters={
+                        "projectName": build_project.project_name,
+                    },
+                    # Use the same dynamic physical resource ID based on S3 object key hash
+                    physical_resource_id=cr.PhysicalResourceId.of(
+                        f"{build_project.project_name}-build-{source_fingerprint}"
+                    ),
+                ),
+                # The runtime's bundled SDK already has startBuild; installing
+                # the latest SDK added an npm download to every cold start
+                install_latest_aws_sdk=False,
+            )
+            # Ensure the build project exists before triggering
+            trigger_build.node.add_dependency(build_project)
 
         # ==============================================================
         # 6. Outputs
@@ -202,12 +306,13 @@ class CodeBuildStack(Construct):
             description="CodeBuild project name for building the container",
         )
 
-        CfnOutput(
-            self,
-            "BuildCommand",
-            value=f"aws codebuild start-build --project-name {build_project.project_name}",
-            description="Command to trigger a container build",
-        )
+        if verbose_outputs:
+            CfnOutput(
+                self,
+                "BuildCommand",
+                value=f"aws codebuild start-build --project-name {build_project.project_name}",
+                description="Command to trigger a container build",
+            )
 
         CfnOutput(
             self,
@@ -219,11 +324,13 @@ class CodeBuildStack(Construct):
         CfnOutput(
             self,
             "ImageUri",
-            value=f"{ecr_repo.repository_uri}:latest",
+            value=f"{ecr_repo.repository_uri}:{image_tag}",
             description="Full ECR image URI (use this for Batch stack deployment)",
         )
 
         # Store attributes for cross-stack references
         self.ecr_repository = ecr_repo
         self.build_project = build_project
-        self.image_uri = f"{ecr_repo.repository_uri}:latest"
+        self.source_asset = source_asset
+        self.image_tag = image_tag
+        self.image_uri = f"{ecr_repo.repository_uri}:{image_tag}"
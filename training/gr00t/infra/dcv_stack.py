@@ -1,8 +1,28 @@
+import functools
 import os
-from aws_cdk import aws_ec2 as ec2, aws_iam as iam, aws_efs as efs, Stack, CfnOutput
+from aws_cdk import (
+    aws_ec2 as ec2,
+    aws_iam as iam,
+    aws_efs as efs,
+    aws_secretsmanager as secretsmanager,
+    Stack,
+    CfnOutput,
+)
 from constructs import Construct
 
 
+@functools.lru_cache(maxsize=1)
+def _load_configure_script() -> str:
+    """Read configure_dcv_instance.sh once per process.
+
+    The script never changes during a synth, so multi-stack apps shouldn't
+    re-read it from disk for every DcvStack instantiation.
+    """
+    path = os.path.join(os.path.dirname(__file__), "configure_dcv_instance.sh")
+    with open(path, "r") as f:
+        return f.read()
+
+
 class DcvStack(Stack):
     def __init__(
         self,
@@ -13,6 +33,8 @@ class DcvStack(Stack):
         efs_id: str = None,
         efs_sg_id: str = None,
         batch_stack=None,
+        image_uri: str = None,
+        verbose_outputs: bool = False,
         **kwargs,
     ) -> None:
         super().__init__(scope, construct_id, **kwargs)
@@ -89,43 +111,161 @@ class DcvStack(Stack):
 
         # 4. User Data Script
         # This script runs on the first boot to set up the instance.
-        # Read the user data script
-        user_data_path = os.path.join(
-            os.path.dirname(__file__), "configure_dcv_instance.sh"
+        user_data_script = _load_configure_script()
+
+        # DCV session password: a random secret generated at deploy time and
+        # fetched by the instance at boot. The previous dcv{account} scheme
+        # baked a guessable password into the rendered user data and a stack
+        # output, and caused a template diff on every account move.
+        dcv_secret = secretsmanager.Secret(
+            self,
+            "DcvPassword",
+            description="Password for the ubuntu user on the DCV instance",
+            generate_secret_string=secretsmanager.SecretStringGenerator(
+                exclude_punctuation=True,
+                include_space=False,
+                password_length=16,
+            ),
         )
-        with open(user_data_path, "r") as f:
-            user_data_script = f.read()
+        dcv_secret.grant_read(instance_role)
 
-        # Create the dynamic password and inject it into the script
-        # Keep this consistent with the stack output below
-        password = f"dcv{self.account}"
-        user_data_script = user_data_script.replace("__PASSWORD__", password)
+        # The configure script's password steps run through eval, so the
+        # variable fetched below expands at execution time.
+        user_data_script = user_data_script.replace("__PASSWORD__", "${DCV_PASSWORD}")
 
-        # Add the modified script to user data
-        user_data = ec2.UserData.for_linux()
-        user_data.add_commands(user_data_script)
+        # Cloud-config part: let cloud-init's package stage install the apt
+        # prerequisites (NFS client, efs-utils build deps) while the instance
+        # is still booting, instead of serializing them inside the shell
+        # script below. amazon-efs-utils itself has no Ubuntu apt package --
+        # the script builds it from source -- so the EFS mount stays in shell.
+        cloud_config = ec2.UserData.custom(
+            "#cloud-config\n"
+            "package_update: true\n"
+            "packages:\n"
+            "  - nfs-common\n"
+            "  - git\n"
+            "  - binutils\n"
+            "  - pkg-config\n"
+            # the shell part needs the CLI to fetch the DCV password before
+            # the script's own AWS CLI v2 install step runs
+            "  - awscli\n"
+        )
 
-        # Add EFS mounting commands (only if EFS is provided)
+        # Shell part: the DCV configure script plus the EFS mount commands.
+        # First, put Docker's data root on the g6 instance-store NVMe (done
+        # before the configure script installs docker, so the daemon writes
+        # there from the start): image pulls and container layers then run at
+        # local-flash speed instead of EBS throughput. The mount lives in a
+        # systemd unit ordered before docker.service rather than inline: the
+        # configure script ends with a scheduled reboot, and without the unit
+        # docker would come back up on the empty EBS directory, silently
+        # dropping every layer pulled during bootstrap. The unit also
+        # re-creates the filesystem when the instance store comes back blank
+        # after a stop/start.
+        user_data = ec2.UserData.for_linux()
+        user_data.add_commands(
+            "cat > /usr/local/sbin/mount-docker-nvme.sh <<'MOUNTEOF'",
+            "#!/bin/bash",
+            "set -e",
+            "NVME_DEV=$(lsblk -dpno NAME,MODEL | awk '/Instance Storage/ {print $1; exit}')",
+            '[ -n "$NVME_DEV" ] || exit 0',
+            '# instance store is blank after a stop/start; (re)format it then',
+            'blkid "$NVME_DEV" >/dev/null 2>&1 || mkfs.xfs -f "$NVME_DEV"',
+            "mkdir -p /var/lib/docker",
+            'mountpoint -q /var/lib/docker || mount -o noatime "$NVME_DEV" /var/lib/docker',
+            "MOUNTEOF",
+            "chmod +x /usr/local/sbin/mount-docker-nvme.sh",
+            "cat > /etc/systemd/system/docker-nvme-mount.service <<'UNITEOF'",
+            "[Unit]",
+            "Description=Mount instance-store NVMe at /var/lib/docker",
+            "Before=docker.service",
+            "After=local-fs.target",
+            "",
+            "[Service]",
+            "Type=oneshot",
+            "RemainAfterExit=yes",
+            "ExecStart=/usr/local/sbin/mount-docker-nvme.sh",
+            "",
+            "[Install]",
+            "WantedBy=multi-user.target",
+            "UNITEOF",
+            "systemctl daemon-reload",
+            "systemctl enable --now docker-nvme-mount.service",
+        )
+        user_data.add_commands(
+            "DCV_PASSWORD=$(aws secretsmanager get-secret-value"
+            f" --secret-id {dcv_secret.secret_arn}"
+            " --query SecretString --output text"
+            f" --region {self.region})",
+            "export DCV_PASSWORD",
+        )
+        # EFS setup runs in a background subshell started before the DCV
+        # configure script, overlapping with the slow apt/driver phases. The
+        # subshell waits for the script's efs-utils build to land before
+        # mounting; the wait at the end keeps bootstrap from finishing with
+        # the mount still pending.
         if efs_fs is not None:
             user_data.add_commands(
-                "# Mount EFS file system with TLS",
-                "echo 'Setting up EFS mount with TLS...'",
-                # EFS utils are installed in configure_dcv_instance.sh; only perform mount here
-                # Log mount action into the bootstrap logs/summary for visibility
-                "echo 'STEP_INFO:EFS:Configuring fstab and mounting' >> /var/log/dcv-bootstrap.summary || true",
-                "mkdir -p /mnt/efs",
-                f"echo '{efs_fs.file_system_id}:/ /mnt/efs efs _netdev,tls 0 0' >> /etc/fstab",
-                # Attempt mount and record success/failure
-                (
-                    "if mount -a; then\n"
-                    "  echo 'STEP_OK:EFS mount' >> /var/log/dcv-bootstrap.summary;\n"
-                    "  echo 'EFS mounted at /mnt/efs' | tee -a /var/log/dcv-bootstrap.log;\n"
-                    "else\n"
-                    "  echo 'STEP_FAIL:EFS mount' >> /var/log/dcv-bootstrap.summary;\n"
-                    "fi"
-                ),
-                "chown ubuntu:ubuntu /mnt/efs || true",
+                "# Mount EFS file system with TLS (in the background)\n"
+                "(\n"
+                "  echo 'STEP_INFO:EFS:Configuring fstab and mounting' >> /var/log/dcv-bootstrap.summary || true\n"
+                "  mkdir -p /mnt/efs\n"
+                f"  echo '{efs_fs.file_system_id}:/ /mnt/efs efs _netdev,tls 0 0' >> /etc/fstab\n"
+                "  # wait for configure_dcv_instance.sh to build efs-utils\n"
+                "  for i in $(seq 1 360); do\n"
+                "    command -v mount.efs >/dev/null 2>&1 && break\n"
+                "    sleep 10\n"
+                "  done\n"
+                "  if mount -a; then\n"
+                "    echo 'STEP_OK:EFS mount' >> /var/log/dcv-bootstrap.summary\n"
+                "    echo 'EFS mounted at /mnt/efs' | tee -a /var/log/dcv-bootstrap.log\n"
+                "  else\n"
+                "    echo 'STEP_FAIL:EFS mount' >> /var/log/dcv-bootstrap.summary\n"
+                "  fi\n"
+                "  chown ubuntu:ubuntu /mnt/efs || true\n"
+                ") &\n"
+                "EFS_BG_PID=$!"
+            )
+        user_data.add_commands(user_data_script)
+        # The configure script schedules "shutdown -r +1" on success, which
+        # would kill the multi-GB pull and the EFS wait below mid-flight. Put
+        # the reboot on hold while bootstrap finishes and re-schedule it at
+        # the end; a failed bootstrap never scheduled one, so nothing is
+        # re-armed in that case.
+        user_data.add_commands(
+            "REBOOT_PENDING=0",
+            "if [ -e /run/systemd/shutdown/scheduled ]; then",
+            "  REBOOT_PENDING=1",
+            "  shutdown -c || true",
+            "fi",
+        )
+        # Warm the Docker layer cache during bootstrap (the configure script
+        # has installed Docker by this point) so the first docker run on the
+        # box doesn't pay the multi-GB pull. Traffic stays in-VPC via the
+        # ECR/S3 endpoints the Batch VPC already carries.
+        if image_uri:
+            user_data.add_commands(
+                f'IMAGE_URI="{image_uri}"',
+                'REGISTRY="${IMAGE_URI%%/*}"',
+                f"(aws ecr get-login-password --region {self.region}"
+                ' | docker login --username AWS --password-stdin "$REGISTRY"'
+                ' && docker pull "$IMAGE_URI") || true',
             )
+        if efs_fs is not None:
+            user_data.add_commands("wait $EFS_BG_PID || true")
+        user_data.add_commands(
+            'if [ "$REBOOT_PENDING" = "1" ]; then',
+            '  nohup shutdown -r +1 "Rebooting to finalize configuration" >/dev/null 2>&1 &',
+            "fi",
+        )
+
+        multipart_user_data = ec2.MultipartUserData()
+        multipart_user_data.add_part(
+            ec2.MultipartBody.from_user_data(
+                cloud_config, 'text/cloud-config; charset="utf-8"'
+            )
+        )
+        multipart_user_data.add_part(ec2.MultipartBody.from_user_data(user_data))
 
         # 5. EC2 Instance
         # The actual virtual machine for visualization.
@@ -135,19 +275,37 @@ class DcvStack(Stack):
             # G6 -> 24GB vRAM, G4dn -> 16GB vRAM
             # Recommended: 2xlarge for running simulation, 4xlarge if also running policy inference
             instance_type=ec2.InstanceType("g6.4xlarge"),
-            machine_image=ec2.MachineImage.lookup(
-                name="ubuntu/images/hvm-ssd/ubuntu-jammy-22.04-amd64-server-20251111",
-                owners=["099720109477"],
+            # Canonical's public SSM alias for the current Ubuntu 22.04 AMD64
+            # AMI, resolved once at synth and pinned in cdk.context.json
+            # (no DescribeImages call, unlike MachineImage.lookup). Without
+            # cached_in_context CloudFormation re-resolves the alias on every
+            # deploy, replacing the instance whenever Canonical publishes a
+            # new AMI. Run `cdk context --reset` to pick up a newer image
+            # deliberately.
+            machine_image=ec2.MachineImage.from_ssm_parameter(
+                "/aws/service/canonical/ubuntu/server/22.04/stable/current/amd64/hvm/ebs-gp2/ami-id",
+                os=ec2.OperatingSystemType.LINUX,
+                cached_in_context=True,
             ),
             vpc=resolved_vpc,
             vpc_subnets=ec2.SubnetSelection(subnet_type=ec2.SubnetType.PUBLIC),
             role=instance_role,
             security_group=sg,
-            user_data=user_data,
+            user_data=multipart_user_data,
+            require_imdsv2=True,
             block_devices=[
                 ec2.BlockDevice(
                     device_name="/dev/sda1",
-                    volume=ec2.BlockDeviceVolume.ebs(100, delete_on_termination=True),
+                    # gp3 well above its 3000 IOPS / 125 MiB/s baseline: the
+                    # bootstrap extracts CUDA drivers, Isaac Sim, and the
+                    # desktop stack, which saturates a default gp2 volume
+                    volume=ec2.BlockDeviceVolume.ebs(
+                        200,
+                        delete_on_termination=True,
+                        volume_type=ec2.EbsDeviceVolumeType.GP3,
+                        iops=6000,
+                        throughput=500,
+                    ),
                 )
             ],
         )
@@ -168,24 +326,31 @@ class DcvStack(Stack):
             value=eip.ref,
             description="Public IP address of the Amazon DCV instance. Connect to this IP.",
         )
-        CfnOutput(
-            self,
-            "DCVConnectionCommand",
-            value=f"dcvviewer -hostname {eip.ref} -port 8443 -user ubuntu",
-            description="Command to connect using the Amazon DCV client.",
-        )
-        CfnOutput(
-            self,
-            "DCVWebURL",
-            value=f"https://{eip.ref}:8443",
-            description="URL to connect using a web browser. You may need to accept a self-signed certificate warning.",
-        )
-        CfnOutput(
-            self,
-            "DCVCredentials",
-            value=f"Username: ubuntu, Password: dcv{self.account}",
-            description="Default credentials for the DCV session.",
-        )
+        # Convenience outputs: everything below is derivable from the public
+        # IP and the secret name, so keep templates/change sets lean by default
+        if verbose_outputs:
+            CfnOutput(
+                self,
+                "DCVConnectionCommand",
+                value=f"dcvviewer -hostname {eip.ref} -port 8443 -user ubuntu",
+                description="Command to connect using the Amazon DCV client.",
+            )
+            CfnOutput(
+                self,
+                "DCVWebURL",
+                value=f"https://{eip.ref}:8443",
+                description="URL to connect using a web browser. You may need to accept a self-signed certificate warning.",
+            )
+            CfnOutput(
+                self,
+                "DCVCredentials",
+                value=(
+                    "Username: ubuntu, Password: aws secretsmanager get-secret-value"
+                    f" --secret-id {dcv_secret.secret_name}"
+                    " --query SecretString --output text"
+                ),
+                description="Username and the command to retrieve the DCV session password.",
+            )
 
         # EFS outputs (only if EFS is provided)
         if efs_fs is not None:
@@ -196,9 +361,10 @@ class DcvStack(Stack):
                 description="EFS File System ID mounted at /mnt/efs for shared storage.",
             )
 
-            CfnOutput(
-                self,
-                "EFSMountPoint",
-                value="/mnt/efs",
-                description="EFS mount point on the DCV instance for shared storage with Batch jobs.",
-            )
+            if verbose_outputs:
+                CfnOutput(
+                    self,
+                    "EFSMountPoint",
+                    value="/mnt/efs",
+                    description="EFS mount point on the DCV instance for shared storage with Batch jobs.",
+                )
@@ -24,6 +24,7 @@ echo "=========================================="
 # Print environment variables for debugging
 echo "Environment Configuration:"
 echo "DATASET_LOCAL_DIR: ${DATASET_LOCAL_DIR}"
+echo "DATASET_PATHS: ${DATASET_PATHS}"
 echo "DATASET_S3_URI: ${DATASET_S3_URI}"
 echo "HF_DATASET_ID: ${HF_DATASET_ID}"
 echo "HF_MODEL_REPO_ID: ${HF_MODEL_REPO_ID}"
@@ -50,10 +51,16 @@ echo "LORA_RANK: ${LORA_RANK}"
 echo "LORA_ALPHA: ${LORA_ALPHA}"
 echo "LORA_DROPOUT: ${LORA_DROPOUT}"
 echo "LORA_FULL_MODEL: ${LORA_FULL_MODEL}"
+echo "LORA_TARGET_MODULES: ${LORA_TARGET_MODULES}"
 echo "WEIGHT_DECAY: ${WEIGHT_DECAY}"
 echo "WARMUP_RATIO: ${WARMUP_RATIO}"
 echo "DATALOADER_NUM_WORKERS: ${DATALOADER_NUM_WORKERS}"
 echo "DATALOADER_PREFETCH_FACTOR: ${DATALOADER_PREFETCH_FACTOR}"
+echo "DATALOADER_PIN_MEMORY: ${DATALOADER_PIN_MEMORY}"
+echo "DEEPSPEED_CONFIG: ${DEEPSPEED_CONFIG}"
+echo "OPTIM: ${OPTIM}"
+echo "TORCH_COMPILE: ${TORCH_COMPILE}"
+echo "GRADIENT_CHECKPOINTING: ${GRADIENT_CHECKPOINTING}"
 echo ""
 echo "Dataset Configuration:"
 echo "BALANCE_DATASET_WEIGHTS: ${BALANCE_DATASET_WEIGHTS}"
@@ -134,6 +141,25 @@ if [ -n "$HF_TOKEN" ] && { [ -n "$HF_DATASET_ID" ] || [ -n "$HF_MODEL_REPO_ID" ]
     fi
 fi
 
+# Apply S3 transfer tuning if provided (consumed by the aws s3 sync calls below)
+if command -v aws >/dev/null 2>&1; then
+    if [ -n "$S3_MAX_CONCURRENCY" ]; then
+        aws configure set default.s3.max_concurrent_requests "$S3_MAX_CONCURRENCY"
+    fi
+    if [ -n "$S3_MULTIPART_CHUNKSIZE" ]; then
+        aws configure set default.s3.multipart_chunksize "$S3_MULTIPART_CHUNKSIZE"
+    fi
+    if [ -n "$S3_MULTIPART_THRESHOLD" ]; then
+        aws configure set default.s3.multipart_threshold "$S3_MULTIPART_THRESHOLD"
+    fi
+    if [ -n "$AWS_S3_ADDRESSING_STYLE" ]; then
+        aws configure set default.s3.addressing_style "$AWS_S3_ADDRESSING_STYLE"
+    fi
+    if [ "$S3_USE_ACCELERATE_ENDPOINT" = "true" ]; then
+        aws configure set default.s3.use_accelerate_endpoint true
+    fi
+fi
+
 # Validate default EFS mount and prepare output/log directories (no env var usage)
 DEFAULT_EFS_BASE="/mnt/efs"
 if mountpoint -q "$DEFAULT_EFS_BASE" || grep -qs " $DEFAULT_EFS_BASE " /proc/mounts; then